@@ -1,7 +1,38 @@
+from collections import OrderedDict
+
 import pandas as pd
 import pandera.pandas as pa
 from pandera import Check
 
+# Keys of snapshots that already validated cleanly; validation is a pure
+# function of the frame's contents, so re-running the checks on the same
+# bytes is wasted work.
+_VALIDATED_KEYS: OrderedDict = OrderedDict()
+_MAX_VALIDATED_KEYS = 8
+
+
+def _df_key(df: pd.DataFrame) -> tuple:
+    return (len(df), int(pd.util.hash_pandas_object(df, index=False).sum()))
+
+
+def validate_cached(df: pd.DataFrame, schema: pa.DataFrameSchema) -> pd.DataFrame:
+    """
+    Validate df against schema, skipping the checks when an identical
+    frame already passed. lazy=True surfaces every error at once on a miss.
+    """
+    key = (id(schema), _df_key(df))
+    if key in _VALIDATED_KEYS:
+        _VALIDATED_KEYS.move_to_end(key)
+        return df
+
+    validated = schema.validate(df, lazy=True)
+
+    _VALIDATED_KEYS[key] = True
+    if len(_VALIDATED_KEYS) > _MAX_VALIDATED_KEYS:
+        _VALIDATED_KEYS.popitem(last=False)
+    return validated
+
+
 df1_schema = pa.DataFrameSchema(
     {
         # Snapshot date stored as string "YYYY-MM-DD"
@@ -59,11 +90,16 @@ df1_schema = pa.DataFrameSchema(
             checks=[
                 Check.ge(0),
                 Check.le(1000),
-                Check.less_than_or_equal_to("Total Complaints"),
             ],
             nullable=False,
         ),
     },
+    # One vectorized comparison instead of the per-element
+    # less_than_or_equal_to column check.
+    checks=Check(
+        lambda df: df["Total Substantiated Complaints"] <= df["Total Complaints"],
+        name="substantiated_le_total",
+    ),
     strict=False,
 )
 
@@ -0,0 +1,27 @@
+# http_client.py
+# One shared keep-alive session for every call to data.cityofnewyork.us:
+# reusing the pooled TLS connection saves the handshake that otherwise
+# dominates small Socrata requests.
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "gzip"
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.8,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ),
+    )
+    return session
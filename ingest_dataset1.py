@@ -1,10 +1,16 @@
 import os
 
 import pandas as pd
-import requests
 from google.oauth2 import service_account
 from pandas_gbq import to_gbq
 
+from http_client import get_session
+
+try:
+    import orjson
+except ImportError:  # optional C parser, stdlib json still works
+    orjson = None
+
 
 def get_gbq_credentials():
     return service_account.Credentials.from_service_account_file(
@@ -20,12 +26,43 @@ FULL_TABLE_ID = f"{DATASET_ID}.{TABLE_ID}"
 
 API_URL = "https://data.cityofnewyork.us/resource/2fir-qns4.json"
 
+NUMERIC_COLS = [
+    "shield_no",
+    "tax_id",
+    "complaint_count",
+    "substantiated_count",
+    "unsubstantiated_count",
+    "exonerated_count",
+    "unfounded_count",
+]
+
 
 def load_data(limit=50000):
     params = {"$limit": limit}
-    r = requests.get(API_URL, params=params)
+    r = get_session().get(API_URL, params=params)
     r.raise_for_status()
-    df = pd.DataFrame(r.json())
+
+    rows = orjson.loads(r.content) if orjson is not None else r.json()
+
+    # Build one list per column instead of letting pandas walk the list
+    # of dicts row by row (Socrata omits null fields, so columns can
+    # appear partway through).
+    columns = {}
+    for i, row in enumerate(rows):
+        for key, value in row.items():
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = [None] * len(rows)
+            col[i] = value
+
+    # The schema is known, so convert numeric columns while assembling --
+    # the frame then holds typed arrays instead of object columns that
+    # clean_data would have to re-coerce.
+    data = {
+        key: pd.to_numeric(values, errors="coerce") if key in NUMERIC_COLS else values
+        for key, values in columns.items()
+    }
+    df = pd.DataFrame(data)
     return df
 
 
@@ -37,18 +74,8 @@ def clean_data(df):
         .str.replace(r"[^a-z0-9_]", "", regex=True)
     )
 
-    numeric_cols = [
-        "shield_no",
-        "tax_id",
-        "complaint_count",
-        "substantiated_count",
-        "unsubstantiated_count",
-        "exonerated_count",
-        "unfounded_count",
-    ]
-
-    for col in numeric_cols:
-        if col in df.columns:
+    for col in NUMERIC_COLS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
     return df
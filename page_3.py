@@ -1,12 +1,13 @@
 # page_3.py
 import time
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
 
 from bigquery_helpers import run_query
-from precinct_helpers import load_dataset1, misconduct_by_precinct
+from precinct_helpers import fetch_command_complaints, misconduct_by_precinct
 
 start_time = time.time()
 
@@ -26,6 +27,18 @@ PROJECT_ID = "fuzzy-potato-491318"
 DATASET_NAME = "Project_Part5"
 TABLE_NAME = "complaints_historic"
 
+# NYPD precinct numbers top out well below this; both datasets are
+# clamped to it so a precinct doubles as an index into fixed-size tables.
+MAX_PRECINCT = 200
+
+# Precincts are bounded to (0, MAX_PRECINCT] by the crime-count query,
+# so the precinct number doubles as the code into this fixed label table.
+PRECINCT_LABELS = np.array([f"Precinct {i}" for i in range(MAX_PRECINCT + 1)], dtype=object)
+
+
+def precinct_name_column(precincts: pd.Series) -> pd.Categorical:
+    return pd.Categorical.from_codes(precincts.to_numpy(dtype="int64"), categories=PRECINCT_LABELS)
+
 
 @st.cache_data(show_spinner=False)
 def fetch_crime_counts_by_precinct(
@@ -33,8 +46,12 @@ def fetch_crime_counts_by_precinct(
     boro: str | None = None,
     law_cat: str | None = None,
 ) -> pd.DataFrame:
+    # Valid precincts are small positive ints; filtering server-side
+    # keeps invalid rows off the wire entirely.
     where_clauses = [
         "addr_pct_cd IS NOT NULL",
+        "addr_pct_cd > 0",
+        f"addr_pct_cd <= {MAX_PRECINCT}",
     ]
 
     if boro:
@@ -47,17 +64,31 @@ def fetch_crime_counts_by_precinct(
 
     query = f"""
         SELECT
-            CAST(addr_pct_cd AS STRING) AS precinct_raw,
+            CAST(addr_pct_cd AS INT64) AS precinct,
             COUNT(*) AS crime_count
         FROM `{PROJECT_ID}.{DATASET_NAME}.{TABLE_NAME}`
         WHERE {where_sql}
-        GROUP BY precinct_raw
+        GROUP BY precinct
         ORDER BY crime_count DESC
         LIMIT {top_n}
     """
     return run_query(query)
 
 
+# persist="disk" keeps the payload across Streamlit restarts, so a new
+# worker starts from a local read instead of re-hitting the API.
+@st.cache_data(show_spinner=False, persist="disk", ttl=24 * 3600, max_entries=32)
+def load_command_complaints() -> pd.DataFrame:
+    # Complaints are summed per command server-side, so the payload is
+    # one row per command instead of one row per officer.
+    return fetch_command_complaints()
+
+
+@st.cache_data(show_spinner=False)
+def cached_misconduct_by_precinct(officers_df: pd.DataFrame) -> pd.DataFrame:
+    return misconduct_by_precinct(officers_df)
+
+
 @st.cache_data(show_spinner=False)
 def fetch_preview_rows() -> pd.DataFrame:
     query = f"""
@@ -82,6 +113,10 @@ law_cat = st.sidebar.selectbox(
     index=0,
 )
 
+if st.sidebar.button("Refresh misconduct data"):
+    load_command_complaints.clear()
+    st.sidebar.success("Cache cleared. Rerun.")
+
 top_n = st.slider("Show top N precincts", min_value=5, max_value=50, value=20, step=5)
 
 with st.spinner("Loading aggregated crime counts from BigQuery..."):
@@ -91,16 +126,9 @@ with st.spinner("Loading aggregated crime counts from BigQuery..."):
         law_cat=None if law_cat == "All" else law_cat,
     )
 # --- LOAD MISCONDUCT DATA ---
-officers_df = load_dataset1()
-misconduct_counts = misconduct_by_precinct(officers_df)
-misconduct_counts = misconduct_counts.rename(
-    columns={
-        "precinct": "precinct_raw",
-        "allegation_count": "misconduct_count",
-    }
-)
-
-misconduct_counts["precinct_raw"] = misconduct_counts["precinct_raw"].astype(str).str.strip()
+command_complaints = load_command_complaints()
+misconduct_counts = cached_misconduct_by_precinct(command_complaints)
+misconduct_counts = misconduct_counts.rename(columns={"allegation_count": "misconduct_count"})
 
 if crime_by_precinct.empty:
     st.error("Still no results from BigQuery.")
@@ -110,17 +138,40 @@ if crime_by_precinct.empty:
     st.caption(f"Page loaded in {elapsed:.2f} seconds")
     st.stop()
 
-with st.expander("View crime count query result"):
+# An expander still serializes its dataframe on every rerun even while
+# collapsed; behind a checkbox the table is only built when asked for.
+if st.checkbox("View crime count query result", value=False):
     st.dataframe(crime_by_precinct, use_container_width=True)
 
-crime_by_precinct["precinct_raw"] = crime_by_precinct["precinct_raw"].astype(str).str.strip()
-crime_by_precinct = crime_by_precinct[crime_by_precinct["precinct_raw"] != ""]
-
-crime_by_precinct["Precinct Name"] = "Precinct " + crime_by_precinct["precinct_raw"]
+crime_by_precinct["Precinct Name"] = precinct_name_column(crime_by_precinct["precinct"])
 
 # --- MERGE DATA HERE ---
-merged_df = crime_by_precinct.merge(misconduct_counts, on="precinct_raw", how="inner")
-merged_df["Precinct Name"] = "Precinct " + merged_df["precinct_raw"]
+# Both sides key on a precinct in [0, MAX_PRECINCT], so an array-indexed
+# join replaces the hash merge: scatter each side into a fixed
+# (MAX_PRECINCT + 1)-slot array and intersect the presence masks.
+misconduct_in_range = misconduct_counts[misconduct_counts["precinct"] <= MAX_PRECINCT]
+
+crime_codes = crime_by_precinct["precinct"].to_numpy(dtype="int64")
+crime_arr = np.zeros(MAX_PRECINCT + 1, dtype=np.int64)
+crime_arr[crime_codes] = crime_by_precinct["crime_count"].to_numpy(dtype="int64")
+crime_present = np.zeros(MAX_PRECINCT + 1, dtype=bool)
+crime_present[crime_codes] = True
+
+misconduct_codes = misconduct_in_range["precinct"].to_numpy(dtype="int64")
+misconduct_arr = np.zeros(MAX_PRECINCT + 1)
+misconduct_arr[misconduct_codes] = misconduct_in_range["misconduct_count"].to_numpy()
+misconduct_present = np.zeros(MAX_PRECINCT + 1, dtype=bool)
+misconduct_present[misconduct_codes] = True
+
+both = crime_present & misconduct_present
+merged_df = pd.DataFrame(
+    {
+        "precinct": np.nonzero(both)[0],
+        "crime_count": crime_arr[both],
+        "misconduct_count": misconduct_arr[both],
+    }
+)
+merged_df["Precinct Name"] = precinct_name_column(merged_df["precinct"])
 
 if merged_df.empty:
     st.error("No matching precincts found between crime data and misconduct data.")
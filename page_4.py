@@ -9,7 +9,7 @@ import plotly.express as px
 import streamlit as st
 
 from bigquery_helpers import load_table
-from utils import compute_group_stats
+from utils import compute_group_stats, filter_group_stats
 
 start_time = time.time()
 
@@ -65,19 +65,25 @@ def _process_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         if col in df.columns:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
+    # Complaint counts are bounded (<=1000), so int16 is enough -- a
+    # quarter of the int64 footprint.
     for col in ["Total Complaints", "Total Substantiated Complaints"]:
         if col in df.columns:
-            df[col] = df[col].fillna(0).astype(int)
+            df[col] = df[col].fillna(0).astype("int16")
 
     for col in DATE_COLS:
         if col in df.columns:
             df[col] = pd.to_datetime(df[col], errors="coerce")
 
+    # Few distinct values repeated across many rows: categorical codes
+    # are far smaller than per-row strings and group on the fast int path.
     for col in ["Current Command", "Current Rank", "Officer Race", "Officer Gender"]:
         if col in df.columns:
-            df[col] = df[col].fillna("Unknown")
+            df[col] = df[col].fillna("Unknown").astype("category")
 
-    return df
+    # Arrow-backed columns pickle as IPC buffers, so the st.cache_data
+    # write on load_snapshot skips the per-row pickle work.
+    return df.convert_dtypes(dtype_backend="pyarrow")
 
 
 @st.cache_data(show_spinner=False)
@@ -95,9 +101,11 @@ def load_snapshot(max_rows: int | None = None) -> pd.DataFrame:
     return _process_dataframe(df)
 
 
+# Cache the unfiltered aggregation once per (df, group_col); the
+# min_officers slider then only pays an O(#groups) filter per tick.
 @st.cache_data(show_spinner=False)
-def cached_group_stats(df: pd.DataFrame, group_col: str, min_officers: int):
-    return compute_group_stats(df, group_col=group_col, min_officers=min_officers)
+def cached_group_stats(df: pd.DataFrame, group_col: str):
+    return compute_group_stats(df, group_col=group_col, min_officers=0)
 
 
 def first_existing_col(df: pd.DataFrame, candidates: list[str]) -> str:
@@ -138,9 +146,10 @@ def plot_quadrant_bubble_chart(  # noqa: PLR0913
 
     # 决定气泡大小
     if size_mode == "Group size" and size_col and size_col in work.columns:
-        sizes_raw = work[size_col].astype(float)
-        if sizes_raw.max() > 0:
-            sizes = (120 + (sizes_raw / sizes_raw.max()) * 900) * size_scale
+        sizes_raw = work[size_col].to_numpy(dtype=float)
+        size_max = sizes_raw.max()
+        if size_max > 0:
+            sizes = 120 * size_scale + (900 * size_scale / size_max) * sizes_raw
         else:
             sizes = np.repeat(260 * size_scale, len(work))
     else:
@@ -191,10 +200,15 @@ def plot_quadrant_bubble_chart(  # noqa: PLR0913
     label_names = set(label_df[group_name_col].astype(str).tolist())
     label_points = work[work[group_name_col].astype(str).isin(label_names)].copy()
 
-    for _, row in label_points.iterrows():
+    for name, ann_x, ann_y in zip(
+        label_points[group_name_col].to_numpy(),
+        label_points[burden_col].to_numpy(),
+        label_points[intensity_col].to_numpy(),
+        strict=True,
+    ):
         ax.annotate(
-            str(row[group_name_col]),
-            (row[burden_col], row[intensity_col]),
+            str(name),
+            (ann_x, ann_y),
             xytext=(5, 5),
             textcoords="offset points",
             fontsize=9,
@@ -300,10 +314,9 @@ df_for_groups = df.copy()
 if group_col in df_for_groups.columns:
     df_for_groups = df_for_groups[df_for_groups[group_col] != "Unknown"]
 
-group_stats = cached_group_stats(
-    df_for_groups,
-    group_col=group_col,
-    min_officers=int(min_officers),
+group_stats = filter_group_stats(
+    cached_group_stats(df_for_groups, group_col=group_col),
+    int(min_officers),
 )
 
 if group_stats.table.empty:
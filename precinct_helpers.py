@@ -1,21 +1,143 @@
 # precinct_helpers.py
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-import requests
 
-DATASET1_BASE = "https://data.cityofnewyork.us/resource/2fir-qns4.json"
+from http_client import get_session
+
+DATASET1_BASE = "https://data.cityofnewyork.us/resource/2fir-qns4.csv"
+
+PAGE_SIZE = 50_000
+MAX_WORKERS = 8
+
+# Below this many rows one plain GET beats a count query plus fan-out.
+PARALLEL_THRESHOLD = 10_000
+
+
+def _page_params(
+    offset: int,
+    page_size: int,
+    where: str | None = None,
+    select: str | None = None,
+) -> dict:
+    params = {"$order": ":id", "$limit": page_size, "$offset": offset}
+    if where:
+        params["$where"] = where
+    if select:
+        params["$select"] = select
+    return params
+
+
+def _get_csv(params: dict) -> pd.DataFrame:
+    r = get_session().get(DATASET1_BASE, params=params, timeout=60)
+    r.raise_for_status()
+    return pd.read_csv(io.BytesIO(r.content), dtype=str)
+
+
+def _count_rows(where: str | None = None) -> int:
+    params = {"$select": "count(*) AS n"}
+    if where:
+        params["$where"] = where
+    r = get_session().get(DATASET1_BASE, params=params, timeout=60)
+    r.raise_for_status()
+    return int(pd.read_csv(io.BytesIO(r.content))["n"].iloc[0])
+
 
+def latest_as_of_date() -> str:
+    """
+    Most recent snapshot date in Dataset 1, as 'YYYY-MM-DD'.
 
-def load_dataset1(limit: int | None = None) -> pd.DataFrame:
+    One max() aggregation server-side; pages that pin a snapshot should
+    cache this (e.g. st.cache_data with a ttl) rather than re-asking per
+    rerun.
+    """
+    r = get_session().get(
+        DATASET1_BASE,
+        params={"$select": "max(as_of_date) AS latest"},
+        timeout=60,
+    )
+    r.raise_for_status()
+    return str(pd.read_csv(io.BytesIO(r.content))["latest"].iloc[0])[:10]
+
+
+def load_dataset1(
+    limit: int | None = None,
+    as_of_date: str | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
     """
     Load Dataset 1 (officer misconduct data) from API.
+
+    Asks Socrata for the row count first, then fetches the $offset pages
+    concurrently over a keep-alive session ($order=:id keeps paging stable)
+    and concatenates them in offset order.
+
+    Passing as_of_date ('YYYY-MM-DD') pins the pull to one daily snapshot
+    via a single date_trunc_ymd equality the server resolves on its index.
+    Passing columns projects the payload to just those fields via $select.
     """
-    params = {}
+    where = f"date_trunc_ymd(as_of_date) = '{as_of_date}'" if as_of_date else None
+    select = ",".join(columns) if columns else None
+
+    # Small bounded pulls don't need the count round-trip or the pool.
+    if limit is not None and limit <= PARALLEL_THRESHOLD:
+        return _get_csv(_page_params(0, limit, where, select))
+
+    total = _count_rows(where)
     if limit is not None:
-        params["$limit"] = limit
+        total = min(total, limit)
+    if total <= 0:
+        return pd.DataFrame()
+
+    def fetch_page(offset: int) -> pd.DataFrame:
+        return _get_csv(_page_params(offset, min(PAGE_SIZE, total - offset), where, select))
+
+    offsets = range(0, total, PAGE_SIZE)
+    if len(offsets) == 1:
+        return fetch_page(0)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        frames = list(executor.map(fetch_page, offsets))
+
+    return pd.concat(frames, ignore_index=True)
 
-    r = requests.get(DATASET1_BASE, params=params, timeout=60)
+
+def fetch_command_complaints() -> pd.DataFrame:
+    """
+    Sum total_complaints by current_command server-side.
+
+    Returns one grouped row per command (a few hundred) instead of the
+    full officer snapshot. misconduct_by_precinct consumes the result
+    unchanged: summing the per-command sums by precinct equals summing
+    the raw rows.
+    """
+    r = get_session().get(
+        DATASET1_BASE,
+        params={
+            "$select": "current_command,sum(total_complaints) AS total_complaints",
+            "$group": "current_command",
+            "$limit": 50_000,
+        },
+        timeout=60,
+    )
     r.raise_for_status()
-    return pd.DataFrame(r.json())
+    return pd.read_csv(io.BytesIO(r.content))
+
+
+def _extract_precinct_series(commands: pd.Series) -> pd.Series:
+    """
+    Precinct numbers from commands like '113 PCT'; NaN everywhere else.
+
+    The command format is fixed ('<digits> PCT'), so splitting off the
+    first token and gating on the 'PCT' suffix stays in vectorized string
+    ops instead of running the regex engine per row.
+    """
+    text = commands.astype("string").str.strip()
+    first_token = text.str.split(" ", n=1).str[0]
+    pct_mask = text.str.endswith("PCT", na=False)
+    return pd.to_numeric(first_token.where(pct_mask), errors="coerce")
 
 
 def extract_precinct_from_command(
@@ -27,11 +149,7 @@ def extract_precinct_from_command(
     """
     out = officers_df.copy()
 
-    out["precinct"] = (
-        out[command_col].astype(str).str.strip().str.extract(r"(\d+)\s*PCT", expand=False)
-    )
-
-    out["precinct"] = pd.to_numeric(out["precinct"], errors="coerce")
+    out["precinct"] = _extract_precinct_series(out[command_col])
     out = out.dropna(subset=["precinct"])
     out["precinct"] = out["precinct"].astype(int)
 
@@ -42,7 +160,7 @@ def misconduct_by_precinct(officers_df: pd.DataFrame) -> pd.DataFrame:
     """
     Auto-detect the command and complaints columns, then sum complaints by precinct.
     """
-    df = officers_df.copy()
+    df = officers_df
 
     # ---- auto-detect command column ----
     possible_command_cols = [
@@ -76,17 +194,29 @@ def misconduct_by_precinct(officers_df: pd.DataFrame) -> pd.DataFrame:
 
     # If the command column is already numeric precincts, keep it.
     # Otherwise extract precinct numbers from strings like "113 PCT".
+    # Only the precinct Series is new, so build it standalone instead of
+    # copying the whole frame.
     if pd.api.types.is_numeric_dtype(df[command_col]):
-        df["precinct"] = pd.to_numeric(df[command_col], errors="coerce")
+        precinct = pd.to_numeric(df[command_col], errors="coerce")
     else:
-        df["precinct"] = (
-            df[command_col].astype(str).str.strip().str.extract(r"(\d+)\s*PCT", expand=False)
-        )
-        df["precinct"] = pd.to_numeric(df["precinct"], errors="coerce")
-
-    df = df.dropna(subset=["precinct"])
-    df["precinct"] = df["precinct"].astype(int)
+        precinct = _extract_precinct_series(df[command_col])
+
+    mask = precinct.notna() & (precinct >= 0)
+    codes = precinct[mask].astype("int64").to_numpy()
+    complaints = (
+        pd.to_numeric(df.loc[mask, complaints_col], errors="coerce")
+        .fillna(0)
+        .to_numpy(dtype="float64")
+    )
 
-    df[complaints_col] = pd.to_numeric(df[complaints_col], errors="coerce").fillna(0)
+    # Precincts are small ints (bounded ~200), so a bincount sums them in
+    # one C pass with no hash table.
+    sums = np.bincount(codes, weights=complaints, minlength=201)
+    present = np.bincount(codes, minlength=201) > 0
 
-    return df.groupby("precinct")[complaints_col].sum().reset_index(name="allegation_count")
+    return pd.DataFrame(
+        {
+            "precinct": np.nonzero(present)[0],
+            "allegation_count": sums[present],
+        }
+    )
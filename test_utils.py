@@ -11,7 +11,9 @@ import pytest
 from utils import (
     GroupStats,
     compute_group_stats,
+    filter_group_stats,
     gini_coefficient,
+    gini_from_histogram,
     lorenz_curve,
     plot_lorenz_curves,
     plot_risk_matrix,
@@ -39,6 +41,17 @@ def test_gini_extreme_concentration_n4():
     assert abs(g - 0.75) < EPS
 
 
+def test_gini_from_histogram_matches_expanded_values():
+    values = [0, 1, 2, 5]
+    counts = [3, 2, 1, 1]
+    expanded = np.repeat(values, counts)
+    assert abs(gini_from_histogram(values, counts) - gini_coefficient(expanded)) < EPS
+
+
+def test_gini_from_histogram_equality_is_zero():
+    assert abs(gini_from_histogram([7], [100]) - 0.0) < EPS
+
+
 def test_top_share_simple_case():
     share = top_share([1, 2, 3, 4], 0.5)  # top2 => 7/10
     assert abs(share - 0.7) < EPS
@@ -89,6 +102,26 @@ def test_compute_group_stats_by_rank():
     assert set(stats.table["Current Rank"]) == {"R1", "R2"}
 
 
+def test_filter_group_stats_matches_direct_min_officers():
+    df = pd.DataFrame(
+        {
+            "Tax ID": [1, 2, 3, 4, 5, 6],
+            "Current Command": ["A", "A", "A", "B", "B", "C"],
+            "Current Rank": ["R1", "R1", "R2", "R2", "R2", "R3"],
+            "Total Complaints": [2, 0, 1, 4, 0, 0],
+            "Total Substantiated Complaints": [1, 0, 0, 1, 0, 0],
+        }
+    )
+
+    direct = compute_group_stats(df, group_col="Current Command", min_officers=2)
+    filtered = filter_group_stats(
+        compute_group_stats(df, group_col="Current Command", min_officers=0), 2
+    )
+
+    assert set(filtered.table["Current Command"]) == set(direct.table["Current Command"])
+    assert abs(filtered.median_avg_complaints - direct.median_avg_complaints) < EPS
+
+
 def test_plot_risk_matrix_runs():
     df = pd.DataFrame(
         {
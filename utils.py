@@ -8,22 +8,85 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+try:  # optional JIT; the pure-NumPy path below stays the fallback
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:  # present whenever the pages hand us Arrow-backed frames
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Below this size the one-off compile isn't worth it.
+NUMBA_MIN_SIZE = 10_000
+
 # =========================
 # Core math helpers
 # =========================
 
+if njit is not None:
+
+    @njit(cache=True, fastmath=True)
+    def _gini_cum_jit(v_sorted: np.ndarray) -> tuple[float, np.ndarray]:
+        # One fused pass over the sorted array: the cumulative sums (which
+        # give the Lorenz curve and any top-k% tail share) plus the
+        # closed-form Gini numerator.
+        n = v_sorted.size
+        cum = np.empty(n, dtype=np.float64)
+        total = 0.0
+        gini_num = 0.0
+        for i in range(n):
+            total += v_sorted[i]
+            cum[i] = total
+            gini_num += (2.0 * i - n + 1.0) * v_sorted[i]
+        if total == 0.0:
+            return 0.0, cum
+
+        g = gini_num / (n * total)
+        return min(max(g, 0.0), 1.0), cum
+
+else:
+    _gini_cum_jit = None
+
 
 def _to_1d_nonneg_array(values: Iterable[float]) -> np.ndarray:
-    arr = np.asarray(list(values), dtype=float).reshape(-1)
+    if isinstance(values, np.ndarray):
+        # Zero-copy when the caller already has a float array.
+        arr = np.asarray(values, dtype=float).reshape(-1)
+    elif isinstance(values, pd.Series):
+        # Straight to the backing buffer -- no intermediate Python list,
+        # and no copy at all when the dtype is already float64.
+        arr = values.to_numpy(dtype=np.float64, copy=False).reshape(-1)
+    else:
+        arr = np.asarray(list(values), dtype=float).reshape(-1)
     if arr.size == 0:
         raise ValueError("Empty input.")
-    if np.any(~np.isfinite(arr)):
+    # min/max catch NaN/Inf and negatives without materializing the
+    # O(n) boolean masks that isfinite/any comparisons would allocate.
+    mn = arr.min()
+    mx = arr.max()
+    if np.isnan(mn) or np.isinf(mn) or np.isinf(mx):
         raise ValueError("Input contains non-finite values (NaN/Inf).")
-    if np.any(arr < 0):
+    if mn < 0:
         raise ValueError("Input contains negative values; expected non-negative.")
     return arr
 
 
+def _lorenz_from_sorted(v_sorted: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    n = v_sorted.size
+    total = v_sorted.sum()
+    x = np.linspace(0.0, 1.0, n + 1)
+
+    if total == 0:
+        return x, x.copy()
+
+    cum = np.cumsum(v_sorted)
+    y = np.concatenate([[0.0], cum / total])
+    y[-1] = 1.0
+    return x, y
+
+
 def lorenz_curve(values: Iterable[float]) -> tuple[np.ndarray, np.ndarray]:
     """
     Return Lorenz curve points (x, y) for non-negative values.
@@ -33,33 +96,103 @@ def lorenz_curve(values: Iterable[float]) -> tuple[np.ndarray, np.ndarray]:
 
     If sum(values)==0 -> equality line.
     """
-    v = _to_1d_nonneg_array(values)
-    n = v.size
-    v_sorted = np.sort(v)
-    total = v_sorted.sum()
-    x = np.linspace(0.0, 1.0, n + 1)
+    return _lorenz_from_sorted(np.sort(_to_1d_nonneg_array(values)))
 
-    if total == 0:
-        return x, x.copy()
 
-    cum = np.cumsum(v_sorted)
-    y = np.concatenate([[0.0], cum / total])
-    y[-1] = 1.0
-    return x, y
+def _gini_from_sorted(v_sorted: np.ndarray) -> float:
+    n = v_sorted.size
+    s = v_sorted.sum()
+    if s == 0:
+        return 0.0
+    idx = np.arange(1, n + 1, dtype=np.float64)
+    g = (2.0 * np.dot(idx, v_sorted) - (n + 1) * s) / (n * s)
+    return float(np.clip(g, 0.0, 1.0))
 
 
 def gini_coefficient(values: Iterable[float]) -> float:
     """
-    Gini via Lorenz area:
-      G = 1 - 2 * area_under_lorenz
+    Gini via the closed form on sorted values:
+      G = (2 * sum(i * x_i) - (n+1) * sum(x)) / (n * sum(x))
+
+    One sort plus a dot product -- no Lorenz curve arrays needed.
+    """
+    return _gini_from_sorted(np.sort(_to_1d_nonneg_array(values)))
+
+
+def gini_from_histogram(values: Iterable[float], counts: Iterable[float]) -> float:
+    """
+    Exact Gini from pre-aggregated (value, count) pairs.
+
+    Equivalent to gini_coefficient(np.repeat(values, counts)) without
+    expanding the histogram, so a server-side aggregate (one row per
+    distinct complaint count) stays tiny on the client.
     """
-    x, y = lorenz_curve(values)
-    # NumPy 2.x: np.trapz removed -> use trapezoid
-    area = np.trapezoid(y, x) if hasattr(np, "trapezoid") else np.trapz(y, x)
-    g = 1.0 - 2.0 * area
+    v = _to_1d_nonneg_array(values)
+    c = np.asarray(list(counts), dtype=float).reshape(-1)
+    if c.size != v.size:
+        raise ValueError("values and counts must have the same length.")
+    if np.any(~np.isfinite(c)) or np.any(c < 0) or np.any(c != np.floor(c)):
+        raise ValueError("counts must be non-negative integers.")
+
+    order = np.argsort(v, kind="stable")
+    v = v[order]
+    c = c[order]
+
+    n = c.sum()
+    if n == 0:
+        raise ValueError("Empty input.")
+    total = float(np.dot(v, c))
+    if total == 0:
+        return 0.0
+
+    # Ranks within each value group are consecutive, so the sum of
+    # rank * value per group has a closed form.
+    start = np.concatenate([[0.0], np.cumsum(c)[:-1]])
+    rank_sums = c * start + c * (c + 1) / 2.0
+    g = (2.0 * float(np.dot(v, rank_sums)) - (n + 1) * total) / (n * total)
     return float(np.clip(g, 0.0, 1.0))
 
 
+def _lorenz_gini_shares(
+    v_sorted: np.ndarray, top_pcts: tuple[float, ...] = ()
+) -> tuple[np.ndarray, np.ndarray, float, tuple[float, ...]]:
+    """
+    Lorenz curve (x, y), Gini, and top-k% shares from one sorted array.
+
+    With numba available and a large enough input, everything comes out
+    of a single fused pass (_gini_cum_jit); the tail shares read straight
+    off the cumulative sums instead of re-summing the tail.
+    """
+    n = v_sorted.size
+    if _gini_cum_jit is not None and n >= NUMBA_MIN_SIZE:
+        g, cum = _gini_cum_jit(v_sorted)
+        total = cum[-1]
+        x = np.linspace(0.0, 1.0, n + 1)
+        if total == 0.0:
+            return x, x.copy(), 0.0, tuple(0.0 for _ in top_pcts)
+        y = np.empty(n + 1)
+        y[0] = 0.0
+        np.divide(cum, total, out=y[1:])
+        y[-1] = 1.0
+        shares = []
+        for p in top_pcts:
+            k = int(np.ceil(n * p))
+            shares.append(1.0 if k >= n else float(1.0 - cum[n - k - 1] / total))
+        return x, y, float(g), tuple(shares)
+
+    x, y = _lorenz_from_sorted(v_sorted)
+    g = _gini_from_sorted(v_sorted)
+    return x, y, g, tuple(_top_share_from_sorted(v_sorted, p) for p in top_pcts)
+
+
+def _top_share_from_sorted(v_sorted: np.ndarray, top_pct: float) -> float:
+    total = v_sorted.sum()
+    if total == 0:
+        return 0.0
+    k = int(np.ceil(v_sorted.size * top_pct))
+    return float(v_sorted[v_sorted.size - k :].sum() / total)
+
+
 def top_share(values: Iterable[float], top_pct: float) -> float:
     """
     Share of total contributed by the top top_pct fraction (e.g. 0.01 for top 1%).
@@ -71,8 +204,11 @@ def top_share(values: Iterable[float], top_pct: float) -> float:
     if total == 0:
         return 0.0
     k = int(np.ceil(v.size * top_pct))
-    v_desc = np.sort(v)[::-1]
-    return float(v_desc[:k].sum() / total)
+    if k >= v.size:
+        return 1.0
+    # Only the top-k sum matters, so an O(n) partition around the k-th
+    # largest element replaces the full O(n log n) sort.
+    return float(np.partition(v, v.size - k)[v.size - k :].sum() / total)
 
 
 # =========================
@@ -94,13 +230,13 @@ def plot_lorenz_curves(
       - substantiated complaints
     and return (fig, ax, summary_dict).
     """
-    x1, y1 = lorenz_curve(total_values)
-    x2, y2 = lorenz_curve(subst_values)
+    # Sort each input once and share the result across the curve, Gini,
+    # and top-share computations instead of re-sorting per metric.
+    vt = np.sort(_to_1d_nonneg_array(total_values))
+    vs = np.sort(_to_1d_nonneg_array(subst_values))
 
-    g1 = gini_coefficient(total_values)
-    g2 = gini_coefficient(subst_values)
-    top1 = top_share(total_values, top_pcts[0])
-    top5 = top_share(total_values, top_pcts[1])
+    x1, y1, g1, (top1, top5) = _lorenz_gini_shares(vt, top_pcts)
+    x2, y2, g2, _ = _lorenz_gini_shares(vs)
 
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.plot(x1, y1, label="Total Complaints")
@@ -171,6 +307,88 @@ class GroupStats:
     median_subst_per_100: float
 
 
+def _group_stats_arrow(
+    key: pd.Series,
+    total: pd.Series,
+    subst: pd.Series,
+    group_col: str,
+    min_officers: int,
+) -> pd.DataFrame:
+    """
+    Group/aggregate without leaving Arrow.
+
+    For Arrow-backed columns pa.Table.group_by counts and sums directly
+    on the Arrow buffers, so nothing is copied out to NumPy just to be
+    hash-aggregated. Null keys stay as their own group, matching the
+    dropna=False pandas path.
+    """
+    table = pa.table(
+        {
+            group_col: pa.Array.from_pandas(key),
+            "total": pa.Array.from_pandas(total),
+            "subst": pa.Array.from_pandas(subst),
+        }
+    )
+    agg = table.group_by(group_col).aggregate(
+        [([], "count_all"), ("total", "sum"), ("subst", "sum")]
+    )
+    grouped = agg.to_pandas().rename(
+        columns={
+            "count_all": "officers",
+            "total_sum": "total_complaints",
+            "subst_sum": "total_substantiated",
+        }
+    )
+    # One aggregation pass covers every group, so the threshold is a
+    # cheap post-agg filter here rather than a pre-agg row filter.
+    if min_officers > 0:
+        grouped = grouped[grouped["officers"] >= min_officers].reset_index(drop=True)
+    return grouped[[group_col, "officers", "total_complaints", "total_substantiated"]]
+
+
+def _group_stats_pandas(  # noqa: PLR0913
+    key: pd.Series,
+    total: pd.Series,
+    subst: pd.Series,
+    group_col: str,
+    min_officers: int,
+    total_col: str,
+    subst_col: str,
+) -> pd.DataFrame:
+    """
+    NumPy-backed counterpart of _group_stats_arrow.
+
+    Grouping on categorical codes takes the int fast path; the pages
+    already deliver Command/Rank as category, so the cast is usually
+    free.
+    """
+    if not isinstance(key.dtype, pd.CategoricalDtype):
+        key = key.astype("category")
+
+    work = pd.DataFrame({group_col: key, total_col: total, subst_col: subst})
+
+    # Push the min_officers threshold ahead of the sums: one cheap
+    # size() pass finds the groups to keep, so the sum aggregations
+    # never touch rows from groups that would be dropped afterwards.
+    if min_officers > 0:
+        sizes = work.groupby(group_col, dropna=False, observed=True, sort=False).size()
+        keep = sizes.index[sizes >= min_officers]
+        if len(keep) < len(sizes):
+            work = work[work[group_col].isin(keep)]
+
+    return (
+        work.groupby(group_col, dropna=False, observed=True, sort=False)
+        .agg(
+            # "size" counts rows without scanning a separate id
+            # column for NaNs the way "count" does.
+            officers=(total_col, "size"),
+            total_complaints=(total_col, "sum"),
+            total_substantiated=(subst_col, "sum"),
+        )
+        .reset_index()
+    )
+
+
 def compute_group_stats(  # noqa: PLR0913
     df: pd.DataFrame,
     *,
@@ -179,39 +397,56 @@ def compute_group_stats(  # noqa: PLR0913
     officer_id_col: str = "Tax ID",
     total_col: str = "Total Complaints",
     subst_col: str = "Total Substantiated Complaints",
+    sort: bool = False,
 ) -> GroupStats:
     """
     Aggregate to group-level (Command or Rank) metrics for risk matrix.
+
+    The table comes back in groupby order; pass sort=True for the old
+    ascending-by-avg-complaints ordering. Callers that need a specific
+    display order already sort themselves.
     """
     _validate_df(df)
     _validate_group_col(df, group_col)
 
-    tmp = df[[group_col, officer_id_col, total_col, subst_col]].copy()
-    tmp[total_col] = pd.to_numeric(tmp[total_col], errors="coerce")
-    tmp[subst_col] = pd.to_numeric(tmp[subst_col], errors="coerce")
+    # The pages already hand us numeric complaint columns; only coerce
+    # when a caller passes raw strings, and never copy the whole frame.
+    total = df[total_col]
+    subst = df[subst_col]
+    if not pd.api.types.is_numeric_dtype(total):
+        total = pd.to_numeric(total, errors="coerce")
+    if not pd.api.types.is_numeric_dtype(subst):
+        subst = pd.to_numeric(subst, errors="coerce")
 
-    if tmp[total_col].isna().any() or tmp[subst_col].isna().any():
+    if total.isna().any() or subst.isna().any():
         raise ValueError("Total/Substantiated columns contain non-numeric values.")
-    if (tmp[total_col] < 0).any() or (tmp[subst_col] < 0).any():
+    if (total < 0).any() or (subst < 0).any():
         raise ValueError("Total/Substantiated columns contain negatives.")
 
-    grouped = (
-        tmp.groupby(group_col, dropna=False)
-        .agg(
-            officers=(officer_id_col, "count"),
-            total_complaints=(total_col, "sum"),
-            total_substantiated=(subst_col, "sum"),
-        )
-        .reset_index()
-    )
+    min_officers = int(min_officers)
 
-    grouped = grouped[grouped["officers"] >= int(min_officers)].copy()
+    if (
+        pa is not None
+        and isinstance(total.dtype, pd.ArrowDtype)
+        and isinstance(subst.dtype, pd.ArrowDtype)
+    ):
+        # Arrow-backed frames (the BigQuery pages) aggregate in Arrow
+        # end-to-end instead of round-tripping through NumPy.
+        grouped = _group_stats_arrow(df[group_col], total, subst, group_col, min_officers)
+    else:
+        grouped = _group_stats_pandas(
+            df[group_col], total, subst, group_col, min_officers, total_col, subst_col
+        )
 
-    grouped["avg_complaints_per_officer"] = grouped["total_complaints"] / grouped["officers"]
-    grouped["substantiated_per_100_complaints"] = np.where(
-        grouped["total_complaints"] > 0,
-        grouped["total_substantiated"] / grouped["total_complaints"] * 100.0,
-        np.nan,
+    # Ratio math on plain float arrays: np.where evaluated the division
+    # for every group (warning on zero totals) before masking; np.divide
+    # with a where mask only divides where the denominator is positive.
+    officers = grouped["officers"].to_numpy(dtype=np.float64)
+    tc = grouped["total_complaints"].to_numpy(dtype=np.float64)
+    ts = grouped["total_substantiated"].to_numpy(dtype=np.float64)
+    grouped["avg_complaints_per_officer"] = tc / officers
+    grouped["substantiated_per_100_complaints"] = (
+        np.divide(ts, tc, out=np.full(tc.size, np.nan), where=tc > 0) * 100.0
     )
 
     if len(grouped):
@@ -221,14 +456,44 @@ def compute_group_stats(  # noqa: PLR0913
         med_x = float("nan")
         med_y = float("nan")
 
+    if sort:
+        grouped = grouped.sort_values("avg_complaints_per_officer", ignore_index=True)
+
     return GroupStats(
-        table=grouped.sort_values("avg_complaints_per_officer").reset_index(drop=True),
+        table=grouped,
         group_col=group_col,
         median_avg_complaints=med_x,
         median_subst_per_100=med_y,
     )
 
 
+def filter_group_stats(group_stats: GroupStats, min_officers: int) -> GroupStats:
+    """
+    Apply a min_officers threshold to an already-aggregated GroupStats.
+
+    Filtering the aggregated table is O(#groups), so callers can cache one
+    unfiltered aggregation and re-threshold per slider tick instead of
+    re-running the full groupby over all officers.
+    """
+    table = group_stats.table[group_stats.table["officers"] >= int(min_officers)].reset_index(
+        drop=True
+    )
+
+    if len(table):
+        med_x = float(np.nanmedian(table["avg_complaints_per_officer"]))
+        med_y = float(np.nanmedian(table["substantiated_per_100_complaints"]))
+    else:
+        med_x = float("nan")
+        med_y = float("nan")
+
+    return GroupStats(
+        table=table,
+        group_col=group_stats.group_col,
+        median_avg_complaints=med_x,
+        median_subst_per_100=med_y,
+    )
+
+
 def plot_risk_matrix(
     group_stats: GroupStats,
     *,
@@ -245,8 +510,10 @@ def plot_risk_matrix(
     if tbl.empty:
         raise ValueError("group_stats.table is empty (min_officers too high or no data).")
 
+    # Fold the normalization into one scalar factor so sizing is a
+    # single multiply-add over the array instead of a divide then scale.
     sizes = tbl["officers"].to_numpy(dtype=float)
-    bubble_sizes = 20.0 + 1800.0 * (sizes / sizes.max())
+    bubble_sizes = 20.0 + (1800.0 / sizes.max()) * sizes
 
     fig, ax = plt.subplots(figsize=(10, 6))
     ax.scatter(
@@ -273,10 +540,16 @@ def plot_risk_matrix(
 
     if annotate_top_n and annotate_top_n > 0:
         top = tbl.nlargest(int(annotate_top_n), "avg_complaints_per_officer")
-        for _, r in top.iterrows():
+        # zip over plain arrays: iterrows builds a Series per row.
+        for name, ax_x, ax_y in zip(
+            top[group_stats.group_col].to_numpy(),
+            top["avg_complaints_per_officer"].to_numpy(),
+            top["substantiated_per_100_complaints"].to_numpy(),
+            strict=True,
+        ):
             ax.annotate(
-                str(r[group_stats.group_col]),
-                (r["avg_complaints_per_officer"], r["substantiated_per_100_complaints"]),
+                str(name),
+                (ax_x, ax_y),
                 textcoords="offset points",
                 xytext=(5, 5),
                 fontsize=8,